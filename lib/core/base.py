@@ -1,12 +1,18 @@
+import os
 import os.path as osp
+import contextlib
 import numpy as np
 from tqdm import tqdm
 import json
 import torch
 import torch.nn as nn
+import torch.distributed as dist
 import torchvision.transforms as transforms
+from torch.nn.parallel import DistributedDataParallel as DDP
 from torch.utils.data import DataLoader
+from torch.utils.data.distributed import DistributedSampler
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 from core.config import cfg
 from core.logger import logger
@@ -16,11 +22,16 @@ from models import get_model, transfer_backbone
 from multiple_datasets import MultipleDatasets
 from core.loss import get_loss
 from coord_utils import heatmap_to_coords
-from funcs_utils import get_optimizer, load_checkpoint, get_scheduler, count_parameters
-from eval_utils import eval_mpjpe, eval_pa_mpjpe, eval_2d_joint_accuracy
+from funcs_utils import get_optimizer, load_checkpoint, get_scheduler, count_parameters, CUDAPrefetcher, get_rank
+from eval_utils import eval_mpjpe_torch, eval_pa_mpjpe_torch, eval_2d_joint_accuracy
 from vis_utils import save_plot
 from human_models import smpl
 
+# name -> dataset class, resolved once at import instead of eval() per call
+DATASET_REGISTRY = {
+    'Human36M': Human36M.dataset,
+}
+
 
 def get_dataloader(dataset_names, is_train):
     if len(dataset_names) == 0: return None, None
@@ -29,13 +40,17 @@ def get_dataloader(dataset_names, is_train):
     batch_per_dataset = cfg[dataset_split].batch_size // len(dataset_names)
     dataset_list, dataloader_list = [], []
 
+    # keep workers alive across epochs and let them queue batches ahead
+    worker_args = {}
+    if cfg.DATASET.workers > 0:
+        worker_args = dict(persistent_workers=True, prefetch_factor=cfg.DATASET.prefetch_factor)
+
     logger.info(f"==> Preparing {dataset_split} Dataloader...")
+    transform = transforms.Compose([
+                    transforms.ToTensor(),
+                    transforms.Normalize(mean=torch.tensor([0.485, 0.456, 0.406]), std=torch.tensor([0.229, 0.224, 0.225]))])
     for name in dataset_names:
-        transform = transforms.Compose([
-                        transforms.ToTensor(),
-                        transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])])
-        
-        dataset = eval(f'{name}.dataset')(transform, dataset_split.lower())
+        dataset = DATASET_REGISTRY[name](transform, dataset_split.lower())
         logger.info(f"# of {dataset_split} {name} data: {len(dataset)}")
         dataset_list.append(dataset)
 
@@ -46,25 +61,40 @@ def get_dataloader(dataset_names, is_train):
                                 shuffle=cfg[dataset_split].shuffle,
                                 num_workers=cfg.DATASET.workers,
                                 pin_memory=True,
-                                drop_last=False)
+                                drop_last=False,
+                                **worker_args)
             dataloader_list.append(dataloader)
         
         return dataset_list, dataloader_list
     else:
         trainset_loader = MultipleDatasets(dataset_list, partition=cfg.DATASET.train_partition, make_same_len=cfg.DATASET.make_same_len)
-        batch_generator = DataLoader(dataset=trainset_loader, batch_size=batch_per_dataset * len(dataset_names), shuffle=cfg[dataset_split].shuffle,
-                                     num_workers=cfg.DATASET.workers, pin_memory=True, drop_last=True)
+        if dist.is_available() and dist.is_initialized():
+            sampler = DistributedSampler(trainset_loader, shuffle=cfg[dataset_split].shuffle)
+            batch_generator = DataLoader(dataset=trainset_loader, batch_size=batch_per_dataset * len(dataset_names), sampler=sampler,
+                                         num_workers=cfg.DATASET.workers, pin_memory=True, drop_last=True, **worker_args)
+        else:
+            batch_generator = DataLoader(dataset=trainset_loader, batch_size=batch_per_dataset * len(dataset_names), shuffle=cfg[dataset_split].shuffle,
+                                         num_workers=cfg.DATASET.workers, pin_memory=True, drop_last=True, **worker_args)
         return dataset_list, batch_generator
 
 
-def prepare_network(args, load_dir='', is_train=True):    
+def prepare_network(args, load_dir='', is_train=True):
+    # input shape is fixed, so let cuDNN pick its fastest conv algorithm once;
+    # TF32 keeps near-FP32 accuracy with Tensor Core matmul throughput
+    torch.backends.cudnn.benchmark = True
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+
     model, checkpoint = None, None
-    
+
     model = get_model(is_train)
-    logger.info(f"==> Constructing Model...")
-    logger.info(f"# of model parameters: {count_parameters(model)}")
-    logger.info(model)
-    
+    if get_rank() == 0:
+        logger.info(f"==> Constructing Model...")
+        logger.info(f"# of model parameters: {count_parameters(model)}")
+        if cfg.MODEL.log_repr:
+            # stringifying the full nn.Module repr takes seconds on large backbones
+            logger.info(model)
+
     if load_dir and (not is_train or args.resume_training):
         logger.info(f"==> Loading checkpoint: {load_dir}")
         checkpoint = load_checkpoint(load_dir=load_dir)
@@ -87,7 +117,7 @@ def train_setup(model, checkpoint):
         for state in optimizer.state.values():
             for k, v in state.items():
                 if torch.is_tensor(v):
-                    state[k] = v.cuda()
+                    state[k] = v.cuda(non_blocking=True)
         curr_lr = 0.0
 
         for param_group in optimizer.param_groups:
@@ -108,12 +138,28 @@ def train_setup(model, checkpoint):
 
 class Trainer:
     def __init__(self, args, load_dir):
+        # launched via torchrun --nproc_per_node=N; falls back to single-process when not
+        if 'WORLD_SIZE' in os.environ and not dist.is_initialized():
+            dist.init_process_group(backend='nccl')
+        self.local_rank = int(os.environ.get('LOCAL_RANK', 0))
+        torch.cuda.set_device(self.local_rank)
+
         self.model, checkpoint = prepare_network(args, load_dir, True)
+        # on CUDA before train_setup so the fused optimizer sees CUDA params at construction
+        self.model = self.model.cuda(self.local_rank)
+        self.model = self.model.to(memory_format=torch.channels_last)
         self.loss, self.optimizer, self.lr_scheduler, self.loss_history, self.error_history = train_setup(self.model, checkpoint)
         dataset_list, self.batch_generator = get_dataloader(cfg.DATASET.train_list, is_train=True)
-        
-        self.model = self.model.cuda()
-        self.model = nn.DataParallel(self.model) 
+
+        if dist.is_initialized():
+            self.model = DDP(self.model, device_ids=[self.local_rank], output_device=self.local_rank,
+                             broadcast_buffers=False, find_unused_parameters=False)
+        # torch.compile hides the DDP wrapper behind an OptimizedModule; keep a handle for no_sync()
+        self.ddp_model = self.model if isinstance(self.model, DDP) else None
+        if hasattr(torch, 'compile'):
+            self.model = torch.compile(self.model, mode='max-autotune', fullgraph=False)
+        self.scaler = torch.cuda.amp.GradScaler()
+        self.accum_steps = cfg.TRAIN.grad_accum
         self.print_freq = cfg.TRAIN.print_freq
         
         self.joint_loss_weight = cfg.TRAIN.joint_loss_weight
@@ -125,59 +171,63 @@ class Trainer:
         
     def train(self, epoch):
         self.model.train()
+        if dist.is_initialized():
+            self.batch_generator.sampler.set_epoch(epoch)
         lr = self.lr_scheduler.get_last_lr()[0]
 
-        running_loss = 0.0
-        running_joint_loss = 0.0
-        running_smpl_joint_loss = 0.0
-        running_proj_loss = 0.0
-        running_pose_param_loss = 0.0
-        running_shape_param_loss = 0.0
-        running_prior_loss = 0.0
-        
-        batch_generator = tqdm(self.batch_generator)
+        # running sums stay on GPU; .item()-style syncs only happen at print_freq and epoch end
+        running = torch.zeros(7, device='cuda')
+
+        self.optimizer.zero_grad(set_to_none=True)
+        batch_generator = tqdm(CUDAPrefetcher(self.batch_generator))
         for i, batch in enumerate(batch_generator):
-            inp_img = batch['img'].cuda()
-            tar_joint_img, tar_joint_cam, tar_smpl_joint_cam = batch['joint_img'].cuda(), batch['joint_cam'].cuda(), batch['smpl_joint_cam'].cuda()
-            tar_pose, tar_shape = batch['pose'].cuda(), batch['shape'].cuda()
-            meta_joint_valid, meta_has_3D, meta_has_param = batch['joint_valid'].cuda(), batch['has_3D'].cuda(), batch['has_param'].cuda()
-            
-            pred_mesh_cam, pred_joint_cam, pred_joint_proj, pred_smpl_pose, pred_smpl_shape = self.model(inp_img)
-
-            loss1 = self.joint_loss_weight * self.loss['joint_cam'](pred_joint_cam, tar_joint_cam, meta_joint_valid * meta_has_3D)
-            loss2 = self.joint_loss_weight * self.loss['smpl_joint_cam'](pred_joint_cam, tar_smpl_joint_cam, meta_has_param[:,:,None])
-            loss3 = self.proj_loss_weight * self.loss['joint_proj'](pred_joint_proj, tar_joint_img, meta_joint_valid)
-            loss4 = self.pose_loss_weight * self.loss['pose_param'](pred_smpl_pose, tar_pose, meta_has_param)
-            loss5 = self.shape_loss_weight * self.loss['shape_param'](pred_smpl_shape, tar_shape, meta_has_param)
-            loss6 = self.prior_loss_weight * self.loss['prior'](pred_smpl_pose[:,3:], pred_smpl_shape)
-            loss = loss1 + loss2 + loss3 + loss4 + loss5 + loss6
+            inp_img = batch['img'].contiguous(memory_format=torch.channels_last)
+            tar_joint_img, tar_joint_cam, tar_smpl_joint_cam = batch['joint_img'], batch['joint_cam'], batch['smpl_joint_cam']
+            tar_pose, tar_shape = batch['pose'], batch['shape']
+            meta_joint_valid, meta_has_3D, meta_has_param = batch['joint_valid'], batch['has_3D'], batch['has_param']
             
+            # skip DDP allreduce on non-final accumulation steps; the forward must also
+            # run under no_sync() or DDP still prepares buckets for the backward
+            is_update_step = (i + 1) % self.accum_steps == 0
+            sync_ctx = self.ddp_model.no_sync() if self.ddp_model is not None and not is_update_step else contextlib.nullcontext()
+            with sync_ctx:
+                with torch.cuda.amp.autocast(dtype=torch.bfloat16):
+                    pred_mesh_cam, pred_joint_cam, pred_joint_proj, pred_smpl_pose, pred_smpl_shape = self.model(inp_img)
+
+                    loss1 = self.joint_loss_weight * self.loss['joint_cam'](pred_joint_cam, tar_joint_cam, meta_joint_valid * meta_has_3D)
+                    loss2 = self.joint_loss_weight * self.loss['smpl_joint_cam'](pred_joint_cam, tar_smpl_joint_cam, meta_has_param[:,:,None])
+                    loss3 = self.proj_loss_weight * self.loss['joint_proj'](pred_joint_proj, tar_joint_img, meta_joint_valid)
+                    loss4 = self.pose_loss_weight * self.loss['pose_param'](pred_smpl_pose, tar_pose, meta_has_param)
+                    loss5 = self.shape_loss_weight * self.loss['shape_param'](pred_smpl_shape, tar_shape, meta_has_param)
+                # the mixture-of-gaussians pose prior is numerically fragile in half precision
+                with torch.cuda.amp.autocast(enabled=False):
+                    loss6 = self.prior_loss_weight * self.loss['prior'](pred_smpl_pose[:,3:].float(), pred_smpl_shape.float())
+                loss = loss1 + loss2 + loss3 + loss4 + loss5 + loss6
+
+                self.scaler.scale(loss / self.accum_steps).backward()
+
             # update weights
-            self.optimizer.zero_grad()
-            loss.backward()
-            self.optimizer.step()
+            if is_update_step:
+                self.scaler.step(self.optimizer)
+                self.scaler.update()
+                self.optimizer.zero_grad(set_to_none=True)
 
             # log
-            loss, loss1, loss2, loss3, loss4, loss5, loss6 = loss.detach(), loss1.detach(), loss2.detach(), loss3.detach(), loss4.detach(), loss5.detach(), loss6.detach()
-            running_loss += float(loss.item())
-            running_joint_loss += float(loss1.item())
-            running_smpl_joint_loss += float(loss2.item())
-            running_proj_loss += float(loss3.item())
-            running_pose_param_loss += float(loss4.item())
-            running_shape_param_loss += float(loss5.item())
-            running_prior_loss += float(loss6.item())
-            
+            running += torch.stack([loss.detach(), loss1.detach(), loss2.detach(), loss3.detach(), loss4.detach(), loss5.detach(), loss6.detach()])
+
             if i % self.print_freq == 0:
+                avg = (running / (i + 1)).tolist()
                 batch_generator.set_description(f'Epoch{epoch} ({i}/{len(batch_generator)}) => '
-                                                f'joint: {loss1:.4f} smpl_joint: {loss2:.4f} proj: {loss3:.4f} pose: {loss4:.4f}, shape: {loss5:.4f}, prior: {loss6:.4f}')
-
-        self.loss_history['total_loss'].append(running_loss / len(batch_generator)) 
-        self.loss_history['joint_loss'].append(running_joint_loss / len(batch_generator))     
-        self.loss_history['smpl_joint_loss'].append(running_smpl_joint_loss / len(batch_generator))     
-        self.loss_history['proj_loss'].append(running_proj_loss / len(batch_generator)) 
-        self.loss_history['pose_param_loss'].append(running_pose_param_loss / len(batch_generator)) 
-        self.loss_history['shape_param_loss'].append(running_shape_param_loss / len(batch_generator)) 
-        self.loss_history['prior_loss'].append(running_prior_loss / len(batch_generator)) 
+                                                f'joint: {avg[1]:.4f} smpl_joint: {avg[2]:.4f} proj: {avg[3]:.4f} pose: {avg[4]:.4f}, shape: {avg[5]:.4f}, prior: {avg[6]:.4f}')
+
+        avg = (running / len(batch_generator)).cpu().tolist()
+        self.loss_history['total_loss'].append(avg[0])
+        self.loss_history['joint_loss'].append(avg[1])
+        self.loss_history['smpl_joint_loss'].append(avg[2])
+        self.loss_history['proj_loss'].append(avg[3])
+        self.loss_history['pose_param_loss'].append(avg[4])
+        self.loss_history['shape_param_loss'].append(avg[5])
+        self.loss_history['prior_loss'].append(avg[6])
         
         logger.info(f'Epoch{epoch} Loss: {self.loss_history["total_loss"][-1]:.4f}')
 
@@ -187,7 +237,12 @@ class Tester:
         if load_dir != '':
             self.model, _ = prepare_network(args, load_dir, False)
             self.model = self.model.cuda()
-            self.model = nn.DataParallel(self.model)
+            self.model = self.model.to(memory_format=torch.channels_last)
+            # DataParallel re-scatters the input every forward; skip it on a single GPU
+            if torch.cuda.device_count() > 1:
+                self.model = nn.DataParallel(self.model)
+            if hasattr(torch, 'compile'):
+                self.model = torch.compile(self.model, mode='max-autotune', fullgraph=False)
 
         dataset_list, self.val_loader = get_dataloader(cfg.DATASET.test_list, is_train=False)
         if dataset_list is not None:
@@ -199,11 +254,26 @@ class Tester:
                 self.eval_mpvpe = True
             else:
                 self.eval_mpvpe = False
-        
-        self.J_regressor = torch.from_numpy(smpl.h36m_joint_regressor).float().cuda()
+
+            # per-sample metric buffers, filled slice-by-slice instead of growing Python lists
+            self._mpjpe_buf = torch.empty(self.dataset_length)
+            self._pa_mpjpe_buf = torch.empty(self.dataset_length)
+            self._mpvpe_buf = torch.empty(self.dataset_length)
+
+        # pre-scaled by 1000 so the meter->milimeter conversion folds into the regression matmul
+        self.J_regressor_mm = 1000.0 * torch.from_numpy(smpl.h36m_joint_regressor).float().cuda()
+        self.eval_joints = torch.as_tensor(np.asarray(smpl.h36m_eval_joints, dtype=np.int64), device='cuda')
+        self.root_idx = int(smpl.h36m_root_joint_idx)
+        self.inv_normalize = transforms.Normalize(mean=torch.tensor([-0.485/0.229, -0.456/0.224, -0.406/0.225]), std=torch.tensor([1/0.229, 1/0.224, 1/0.225]))
 
         self.print_freq = cfg.TRAIN.print_freq
         self.vis_freq = cfg.TEST.vis_freq
+        if cfg.TEST.vis:
+            # image/obj/plot dumps run off the eval loop; a single worker serializes the
+            # vis_3d_pose jobs since pyplot's figure registry is global, not thread-safe
+            import matplotlib
+            matplotlib.use('Agg')
+            self._vis_pool = ThreadPoolExecutor(max_workers=1)
         
         self.mpjpe = 9999
         self.pa_mpjpe = 9999
@@ -214,38 +284,37 @@ class Tester:
             self.model = current_model
         self.model.eval()
         
-        mpjpe, pa_mpjpe, mpvpe = [], [], []
-        
+        cursor = 0
+
         eval_prefix = f'Epoch{epoch} ' if epoch else ''
-        loader = tqdm(self.val_loader)
+        loader = tqdm(CUDAPrefetcher(self.val_loader))
         with torch.no_grad():
             for i, batch in enumerate(loader):
-                inp_img = batch['img'].cuda()
+                inp_img = batch['img'].contiguous(memory_format=torch.channels_last)
                 batch_size = inp_img.shape[0]
 
                 # feed-forward
                 pred_mesh_cam, pred_joint_cam, pred_joint_proj, pred_smpl_pose, pred_smpl_shape = self.model(inp_img)
-                # meter to milimeter
-                pred_mesh_cam, pred_joint_cam = pred_mesh_cam * 1000, pred_joint_cam * 1000
-
-                # eval post processing
-                pred_joint_cam = torch.matmul(self.J_regressor[None, :, :], pred_mesh_cam)
-                pred_joint_cam = pred_joint_cam.cpu().numpy()
-                tar_joint_cam = batch['joint_cam'].cpu().numpy()
-                pred_mesh_cam = pred_mesh_cam.cpu().numpy()
-                tar_mesh_cam = batch['mesh_cam'].cpu().numpy()
-                
+
+                # eval post processing; everything stays on GPU, only (B,) metrics come back.
+                # the mesh stays in meters here: the mm scale lives in J_regressor_mm
+                pred_joint_cam = torch.matmul(self.J_regressor_mm[None, :, :], pred_mesh_cam)
+                tar_joint_cam = batch['joint_cam']
+                tar_mesh_cam = batch['mesh_cam']
+
                 mpjpe_i, pa_mpjpe_i = self.eval_3d_joint(pred_joint_cam, tar_joint_cam)
-                mpjpe.extend(mpjpe_i); pa_mpjpe.extend(pa_mpjpe_i)
-                mpjpe_i, pa_mpjpe_i = sum(mpjpe_i)/batch_size, sum(pa_mpjpe_i)/batch_size
-                
+                self._mpjpe_buf[cursor:cursor + batch_size] = mpjpe_i.cpu()
+                self._pa_mpjpe_buf[cursor:cursor + batch_size] = pa_mpjpe_i.cpu()
+
                 if self.eval_mpvpe:
                     mpvpe_i = self.eval_mesh(pred_mesh_cam, tar_mesh_cam, pred_joint_cam, tar_joint_cam)
-                    mpvpe.extend(mpvpe_i)
-                    mpvpe_i = sum(mpvpe_i)/batch_size
-                                
+                    self._mpvpe_buf[cursor:cursor + batch_size] = mpvpe_i.cpu()
+                cursor += batch_size
+
                 if i % self.print_freq == 0:
+                    mpjpe_i, pa_mpjpe_i = self._mpjpe_buf[:cursor].mean(), self._pa_mpjpe_buf[:cursor].mean()
                     if self.eval_mpvpe:
+                        mpvpe_i = self._mpvpe_buf[:cursor].mean()
                         loader.set_description(f'{eval_prefix}({i}/{len(self.val_loader)}) => MPJPE: {mpjpe_i:.2f}, PA-MPJPE: {pa_mpjpe_i:.2f} MPVPE: {mpvpe_i:.2f}')
                     else:
                         loader.set_description(f'{eval_prefix}({i}/{len(self.val_loader)}) => MPJPE: {mpjpe_i:.2f}, PA-MPJPE: {pa_mpjpe_i:.2f}')
@@ -255,21 +324,25 @@ class Tester:
                     from vis_utils import vis_3d_pose, save_obj
                     
                     if i % self.vis_freq == 0:
-                        inv_normalize = transforms.Normalize(mean=[-0.485/0.229, -0.456/0.224, -0.406/0.225], std=[1/0.229, 1/0.224, 1/0.225])
-                        img = inv_normalize(inp_img[0]).cpu().numpy().transpose(1,2,0)[:,:,::-1]
+                        img = self.inv_normalize(inp_img[0]).cpu().numpy().transpose(1,2,0)[:,:,::-1]
                         img = np.ascontiguousarray(img, dtype=np.uint8)
-                        cv2.imwrite(osp.join(cfg.vis_dir, f'test_{i}_img.png'), img)
-                        
-                        vis_3d_pose(pred_joint_cam[0], smpl.h36m_skeleton, 'human36', osp.join(cfg.vis_dir, f'test_{i}_joint_cam_pred.png'))
-                        vis_3d_pose(tar_joint_cam[0], smpl.h36m_skeleton, 'human36', osp.join(cfg.vis_dir, f'test_{i}_joint_cam_gt.png'))
-                        
-                        save_obj(pred_mesh_cam[0], smpl.face, osp.join(cfg.vis_dir, f'test_{i}_mesh_cam_pred.obj'))
-                        if self.eval_mpvpe: save_obj(tar_mesh_cam[0], smpl.face, osp.join(cfg.vis_dir, f'test_{i}_mesh_cam_gt.obj'))
+                        self._vis_pool.submit(cv2.imwrite, osp.join(cfg.vis_dir, f'test_{i}_img.png'), img)
+
+                        self._vis_pool.submit(vis_3d_pose, pred_joint_cam[0].cpu().numpy(), smpl.h36m_skeleton, 'human36', osp.join(cfg.vis_dir, f'test_{i}_joint_cam_pred.png'))
+                        self._vis_pool.submit(vis_3d_pose, tar_joint_cam[0].cpu().numpy(), smpl.h36m_skeleton, 'human36', osp.join(cfg.vis_dir, f'test_{i}_joint_cam_gt.png'))
+
+                        self._vis_pool.submit(save_obj, (pred_mesh_cam[0] * 1000).cpu().numpy(), smpl.face, osp.join(cfg.vis_dir, f'test_{i}_mesh_cam_pred.obj'))
+                        if self.eval_mpvpe: self._vis_pool.submit(save_obj, tar_mesh_cam[0].cpu().numpy(), smpl.face, osp.join(cfg.vis_dir, f'test_{i}_mesh_cam_gt.obj'))
                        
-            self.mpjpe = sum(mpjpe) / self.dataset_length
-            self.pa_mpjpe = sum(pa_mpjpe) / self.dataset_length
-            self.mpvpe = sum(mpvpe) / self.dataset_length
-            
+            if cfg.TEST.vis:
+                # flush pending dumps; re-create the pool so test() can run again next epoch
+                self._vis_pool.shutdown(wait=True)
+                self._vis_pool = ThreadPoolExecutor(max_workers=1)
+
+            self.mpjpe = self._mpjpe_buf[:cursor].mean().item()
+            self.pa_mpjpe = self._pa_mpjpe_buf[:cursor].mean().item()
+            self.mpvpe = self._mpvpe_buf[:cursor].mean().item() if self.eval_mpvpe else 0.0
+
             if self.eval_mpvpe:
                 logger.info(f'>> {eval_prefix} MPJPE: {self.mpjpe:.2f}, PA-MPJPE: {self.pa_mpjpe:.2f} MPVPE: {self.mpvpe:.2f}')
             else:
@@ -294,29 +367,20 @@ class Tester:
         save_plot(loss_history['total_loss'], epoch, title='Total Loss')
 
     def eval_3d_joint(self, pred, target):
-        pred, target = pred.copy(), target.copy()
-        batch_size = pred.shape[0]
-        
-        pred, target = pred - pred[:, None, smpl.h36m_root_joint_idx, :], target - target[:, None, smpl.h36m_root_joint_idx, :]
-        pred, target = pred[:, smpl.h36m_eval_joints, :], target[:, smpl.h36m_eval_joints, :]
-        
-        mpjpe, pa_mpjpe = [], []
-        for j in range(batch_size):
-            mpjpe.append(eval_mpjpe(pred[j], target[j]))
-            pa_mpjpe.append(eval_pa_mpjpe(pred[j], target[j]))
-        
+        pred, target = pred - pred[:, self.root_idx:self.root_idx+1], target - target[:, self.root_idx:self.root_idx+1]
+        pred, target = pred[:, self.eval_joints], target[:, self.eval_joints]
+
+        mpjpe = eval_mpjpe_torch(pred, target)
+        pa_mpjpe = eval_pa_mpjpe_torch(pred, target)
+
         return mpjpe, pa_mpjpe
-    
-    
+
+
     def eval_mesh(self, pred, target, pred_joint_cam, gt_joint_cam):
-        pred, target = pred.copy(), target.copy()
-        batch_size = pred.shape[0]
-        
-        pred, target = pred - pred_joint_cam[:, None, smpl.h36m_root_joint_idx, :], target - gt_joint_cam[:, None, smpl.h36m_root_joint_idx, :]
-        pred, target = pred[:, smpl.h36m_eval_joints, :], target[:, smpl.h36m_eval_joints, :]
-        
-        mpvpe = []
-        for j in range(batch_size):
-            mpvpe.append(eval_mpjpe(pred[j], target[j]))
-        
+        # pred arrives in meters; scaling inside the alignment expression lets inductor fuse it
+        pred = pred[:, self.eval_joints] * 1000 - pred_joint_cam[:, self.root_idx:self.root_idx+1]
+        target = target[:, self.eval_joints] - gt_joint_cam[:, self.root_idx:self.root_idx+1]
+
+        mpvpe = eval_mpjpe_torch(pred, target)
+
         return mpvpe
\ No newline at end of file
@@ -42,6 +42,7 @@ cfg.DATASET.train_partition = [1.0]
 cfg.DATASET.test_list = []
 cfg.DATASET.make_same_len = False
 cfg.DATASET.workers = 16
+cfg.DATASET.prefetch_factor = 2
 cfg.DATASET.random_seed = 123
 
 """ Model """
@@ -56,6 +57,7 @@ cfg.MODEL.predictor_hidden_dim = 256
 cfg.MODEL.predictor_pose_feat_dim = 128
 cfg.MODEL.predictor_shape_feat_dim = 64
 cfg.MODEL.weight_path = ''
+cfg.MODEL.log_repr = False
 
 """ Train Detail """
 cfg.TRAIN = edict()
@@ -69,6 +71,7 @@ cfg.TRAIN.lr = 1e-3
 cfg.TRAIN.lr_step = [20]
 cfg.TRAIN.lr_factor = 0.1
 cfg.TRAIN.optimizer = 'rmsprop'
+cfg.TRAIN.grad_accum = 1
 cfg.TRAIN.print_freq = 10
 cfg.TRAIN.non_joints_num = 24
 cfg.TRAIN.heatmap_sigma = 10
@@ -35,6 +35,33 @@ def rigid_align(A, B):
     A2 = np.transpose(np.dot(c*R, np.transpose(A))) + t
     return A2
 
+def eval_mpjpe_torch(predicted, target):
+    return torch.linalg.norm(predicted - target, dim=-1).mean(dim=-1)
+
+def eval_pa_mpjpe_torch(predicted, target):
+    predicted = rigid_align_torch(predicted, target)
+    return eval_mpjpe_torch(predicted, target)
+
+def rigid_align_torch(A, B):
+    ''' Batched rigid_align over (batch, joint_num, 3) tensors, stays on device '''
+    n = A.shape[1]
+    centroid_A = A.mean(dim=1, keepdim=True)
+    centroid_B = B.mean(dim=1, keepdim=True)
+    H = torch.matmul((A - centroid_A).transpose(1, 2), B - centroid_B) / n
+    U, s, V = torch.linalg.svd(H)
+    det = torch.linalg.det(torch.matmul(V.transpose(1, 2), U.transpose(1, 2)))
+    s, V = s.clone(), V.clone()
+    neg = det < 0
+    s[neg, -1] = -s[neg, -1]
+    V[neg, 2] = -V[neg, 2]
+    R = torch.matmul(V.transpose(1, 2), U.transpose(1, 2))
+
+    varP = A.var(dim=1, unbiased=False).sum(dim=-1)
+    c = s.sum(dim=-1) / varP
+
+    t = centroid_B - c[:, None, None] * torch.matmul(centroid_A, R.transpose(1, 2))
+    return c[:, None, None] * torch.matmul(A, R.transpose(1, 2)) + t
+
 
 def calc_dists(preds, target, normalize):
     preds = preds.astype(np.float32)
@@ -1,6 +1,7 @@
 import os
 import sys
 import time
+import inspect
 import math
 import numpy as np
 import cv2
@@ -8,6 +9,7 @@ import shutil
 from collections import OrderedDict
 
 import torch
+import torch.distributed as dist
 import torch.optim as optim
 from torch.nn import functional as F
 import matplotlib.pyplot as plt
@@ -64,10 +66,56 @@ def stop():
     sys.exit()
 
 
+class CUDAPrefetcher:
+    """Iterate a DataLoader one batch ahead, copying tensors to the GPU on a side stream
+    so host-to-device transfer overlaps with the model's forward/backward."""
+    def __init__(self, loader, device=None):
+        self.loader = loader
+        self.device = device if device is not None else torch.cuda.current_device()
+        self.stream = torch.cuda.Stream(self.device)
+        self.next_batch = None
+
+    def __len__(self):
+        return len(self.loader)
+
+    def __iter__(self):
+        self.loader_iter = iter(self.loader)
+        self.preload()
+        return self
+
+    def preload(self):
+        try:
+            batch = next(self.loader_iter)
+        except StopIteration:
+            self.next_batch = None
+            return
+        with torch.cuda.stream(self.stream):
+            self.next_batch = {k: v.to(self.device, non_blocking=True) if torch.is_tensor(v) else v
+                               for k, v in batch.items()}
+
+    def __next__(self):
+        if self.next_batch is None:
+            raise StopIteration
+        torch.cuda.current_stream().wait_stream(self.stream)
+        batch = self.next_batch
+        for v in batch.values():
+            if torch.is_tensor(v):
+                v.record_stream(torch.cuda.current_stream())
+        self.preload()
+        return batch
+
+
+def get_rank():
+    if dist.is_available() and dist.is_initialized():
+        return dist.get_rank()
+    return 0
+
+
 def check_data_parallel(train_weight):
     new_state_dict = OrderedDict()
     for k, v in train_weight.items():
-        name = k[7:]  if k.startswith('module') else k  # remove `module.`
+        name = k.replace('_orig_mod.', '')  # remove torch.compile wrapper prefix
+        name = name[7:] if name.startswith('module') else name  # remove `module.`
         new_state_dict[name] = v
     return new_state_dict
 
@@ -76,6 +124,14 @@ def count_parameters(model):
     return sum(p.numel() for p in model.parameters() if p.requires_grad)
 
 
+def fused_optim_args(optim_cls, params):
+    # fuse the moment updates into one kernel per parameter (torch >= 2.0); the fused
+    # impl requires the params to already live on CUDA at construction
+    if len(params) > 0 and all(p.is_cuda for p in params) and 'fused' in inspect.signature(optim_cls).parameters:
+        return {'fused': True}
+    return {}
+
+
 def get_optimizer(model):
     total_params = []
     for module in model.trainable_modules:
@@ -98,13 +154,15 @@ def get_optimizer(model):
     elif cfg.TRAIN.optimizer == 'adam':
         optimizer = optim.Adam(
             total_params,
-            lr=cfg.TRAIN.lr
+            lr=cfg.TRAIN.lr,
+            **fused_optim_args(optim.Adam, total_params)
         )
     elif cfg.TRAIN.optimizer == 'adamw':
         optimizer = optim.AdamW(
             total_params,
             lr=cfg.TRAIN.lr,
-            weight_decay=0.1
+            weight_decay=0.1,
+            **fused_optim_args(optim.AdamW, total_params)
         )
 
     return optimizer
@@ -5,7 +5,7 @@ import numpy as np
 import __init_path
 import shutil
 
-from funcs_utils import save_checkpoint, check_data_parallel
+from funcs_utils import save_checkpoint, check_data_parallel, get_rank
 from core.config import cfg, update_config
 from core.logger import logger
 
@@ -36,15 +36,18 @@ for epoch in range(cfg.TRAIN.begin_epoch, cfg.TRAIN.end_epoch + 1):
     trainer.train(epoch)
     trainer.lr_scheduler.step()
     
-    if len(cfg.DATASET.test_list) > 0:
-        tester.test(epoch, current_model=trainer.model)    
+    if len(cfg.DATASET.test_list) > 0 and get_rank() == 0:
+        tester.test(epoch, current_model=trainer.model)
     
     is_best = None
     if len(trainer.error_history['pa_mpjpe']) > 0:
         is_best = tester.pa_mpjpe < min(trainer.error_history['pa_mpjpe'])
 
-    tester.save_history(trainer.loss_history, trainer.error_history, epoch) 
-        
+    if get_rank() != 0:
+        continue
+
+    tester.save_history(trainer.loss_history, trainer.error_history, epoch)
+
     save_checkpoint({
         'epoch': epoch,
         'model_state_dict': check_data_parallel(trainer.model.state_dict()),